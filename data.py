@@ -1,46 +1,76 @@
 import json
+from functools import cache
+
+import numpy as np
 
 from config_files.configuration import make_directory
+from support_functions import WEIGHT_DTYPE
 
 
-class Data:
-    """Класс Data предназначен для работы с набором данных."""
+@cache
+def _load_dataset(file_path: str) -> dict[str, dict[str, np.ndarray]]:
+    """
+    Загружает набор данных из JSON файла.
+    Результат кэшируется, поэтому файл читается только при первом обращении.
+    Образцы каждого класса преобразуются в один непрерывный массив формы (количество образцов, размер образца)
+    с типом данных WEIGHT_DTYPE.
 
-    data_name: str = 'numbers'
-    data_class_name = 1
-    data_number: int = 1
+    :param file_path: Путь к JSON файлу с набором данных.
+    :return: Словарь с набором данных, где для каждого класса хранится массив его образцов.
+    :raises ValueError: Если файл не найден или содержит некорректный JSON.
+    """
     make_directory('encoders')
-    file_path: str = 'encoders/encoded_images.json'
-    dataset: dict[str, any]
-
     try:
         with open(file_path, 'r') as f:
-            dataset = json.load(f)
+            raw_dataset: dict[str, dict[str, list[list[float]]]] = json.load(f)
     except FileNotFoundError:
         raise ValueError(f'Файл не найден: {file_path}')
     except json.JSONDecodeError:
         raise ValueError(f'Ошибка декодирования JSON в файле: {file_path}')
+    return {
+        data_name: {
+            data_class_name: np.asarray(samples, dtype=WEIGHT_DTYPE) for data_class_name, samples in classes.items()
+        }
+        for data_name, classes in raw_dataset.items()
+    }
+
+
+class _LazyDataset:
+    """Дескриптор, откладывающий загрузку набора данных до первого обращения к нему."""
+
+    def __get__(self, instance, owner) -> dict[str, dict[str, np.ndarray]]:
+        return _load_dataset(owner.file_path)
+
+
+class Data:
+    """Класс Data предназначен для работы с набором данных."""
+
+    data_name: str = 'numbers'
+    data_class_name = 1
+    data_number: int = 1
+    file_path: str = 'encoders/encoded_images.json'
+    dataset: dict[str, dict[str, np.ndarray]] = _LazyDataset()
 
     @classmethod
-    def get_data_dict(cls) -> dict[int, any]:
+    def _samples(cls) -> np.ndarray | list:
         """
-        Возвращает словарь данных.
-        :return: Словарь с данными, где ключи - порядковые номера классов изображений.
+        Возвращает образцы текущего класса данных.
+        :return: Образцы класса в порядке их номеров (номер изображения - индекс плюс один).
         """
-        return dict(list(enumerate(cls.dataset[cls.data_name].get(str(cls.data_class_name), []), 1)))
+        return cls.dataset[cls.data_name].get(str(cls.data_class_name), [])
 
     def get_data_sample(self) -> any:
         """
         Возвращает данные для текущего изображения.
         :return: Данные для текущего изображения.
         """
-        result = self.get_data_dict().get(self.data_number)
-        if result is None:
+        samples: np.ndarray | list = self._samples()
+        if not 1 <= self.data_number <= len(samples):
             raise ValueError(
                 f'Номер изображения {self.data_number} или '
                 f'номер класса изображений {self.data_class_name} за пределами диапазона!'
             )
-        return result
+        return samples[self.data_number - 1]
 
     def get_normalized_target_value(self, data_number: int) -> float:
         """
@@ -48,8 +78,8 @@ class Data:
         :param data_number: Номер данных, для которых нужно нормированное значение.
         :return: Нормированное значение целевого объекта.
         """
-        data_dict = [key for key in self.get_data_dict()]
-        return data_dict[data_number - 1] / 10
+        # Номера изображений идут подряд начиная с единицы, поэтому нормированное значение равно номеру, деленному на 10.
+        return data_number / 10
 
     def get_target_value_by_key(self, value_by_key: str) -> float:
         """
@@ -58,7 +88,7 @@ class Data:
         :param value_by_key: Ключ словаря данных.
         :return: Целевое значение целевого объекта.
         """
-        target_values = {
-            key: float(key) / 10 for key in self.dataset[self.data_name]
-        }
-        return target_values.get(value_by_key, 0.0)
+        # Целевое значение вычисляется только для запрошенного ключа, без построения словаря для всех ключей.
+        if value_by_key in self.dataset[self.data_name]:
+            return float(value_by_key) / 10
+        return 0.0
@@ -1,12 +1,16 @@
 from random import uniform, seed
 
+import numpy as np
+
 from config_files.configuration import logger
-from support_functions import InitializationFunctions
+from support_functions import InitializationFunctions, WEIGHT_DTYPE
 
 
 class LayerBuilder(InitializationFunctions):
     """Класс предназначен для создания слоёв нейронной сети."""
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         """
         Возвращает строковое представление объекта LayerBuilder.
@@ -46,8 +50,9 @@ class LayerBuilder(InitializationFunctions):
 
     def select_weights_mode(
             self, training, input_size: int, neuron_number: int,
-            weights: list[list[float]] | None, init_func: str, test_mode: bool
-    ) -> list[list[float]]:
+            weights: list[list[float]] | np.ndarray | None, init_func: str, test_mode: bool,
+            dtype: np.dtype = WEIGHT_DTYPE
+    ) -> np.ndarray:
         """
         Определяет и инициализирует режим весов для слоя нейронной сети.
 
@@ -57,21 +62,22 @@ class LayerBuilder(InitializationFunctions):
         :param weights: Существующий список весов или None, если веса нужно инициализировать.
         :param init_func: Метод инициализации весов ('uniform', 'xavier', 'he').
         :param test_mode: Флаг, указывающий на тестовый режим. При тестовом режиме перед инициализацией задается фиксированное начальное значение для генератора случайных чисел для воспроизводимости.
+        :param dtype: Тип данных возвращаемой матрицы весов. По умолчанию WEIGHT_DTYPE.
 
-        :return: Список инициализированных весов, если текущий режим обучения или веса отсутствуют. В противном случае возвращает переданные веса.
+        :return: Матрица (нейроны x входы) инициализированных весов, если текущий режим обучения или веса отсутствуют.
+            В противном случае возвращает переданные веса, приведенные к типу dtype.
         """
         # Проверяет, находится ли модель в режиме обучения или установлены ли веса.
-        if training or not weights:
-            # Если активирован тестовый режим, устанавливается фиксированное значение для генератора случайных чисел.
-            if test_mode:
-                seed(0)
+        if training or weights is None or not len(weights):
+            # Если активирован тестовый режим, генератор случайных чисел создается с фиксированным начальным значением.
+            rng: np.random.Generator = np.random.default_rng(0 if test_mode else None)
             logger.info(f'Инициализация весов для входных данных размером {input_size} и {neuron_number} нейронов.')
             # Получение пределов инициализации, вызывается select_init_func с соответствующими параметрами.
             limits: float | tuple[float, float] = self._select_init_func(init_func, input_size, neuron_number)
-            # Создаёт и возвращает двумерный список весов, используя переданные пределы для каждого нейрона.
-            return [[uniform(*limits) for _ in range(input_size)] for _ in range(neuron_number)]
-        # Если веса уже установлены и модель не в режиме обучения, возвращает существующие веса.
-        return weights
+            # Создаёт всю матрицу весов одним вызовом, используя переданные пределы для каждого нейрона.
+            weights = rng.uniform(*limits, size=(neuron_number, input_size))
+        # Веса хранятся непрерывной (C-порядок) матрицей одного типа; уже подходящий массив не копируется.
+        return np.ascontiguousarray(weights, dtype=dtype)
 
     def select_bias_mode(
             self, training, bias: float, init_func: str, test_mode: bool
@@ -103,13 +109,15 @@ class LayerBuilder(InitializationFunctions):
 
     @staticmethod
     def calculate_neuron_dataset(
-            input_dataset: list[int | float], neuron_number: int, weights: list[list[int | float]],
-            bias: float, activate_func: callable, switch: bool, test_mode: bool
-    ) -> list[float]:
+            input_dataset: list[int | float] | np.ndarray, neuron_number: int,
+            weights: list[list[int | float]] | np.ndarray, bias: float, activate_func: callable,
+            switch: bool, test_mode: bool
+    ) -> np.ndarray:
         """
         Вычисляет выходные данные для заданного количества нейронов на основе входных данных и весов.
+        Входные данные могут быть одним образцом или пакетом образцов (двумерный массив, по образцу в строке).
 
-        :param input_dataset: Список входных данных для нейронов.
+        :param input_dataset: Список входных данных для нейронов или пакет таких списков.
         :param neuron_number: Количество нейронов, для которых необходимо произвести вычисления.
         :param weights: Двумерный список весов для каждого нейрона.
         :param bias: Смещение, которое будет добавлено или вычтено из взвешенной суммы, в зависимости от параметра switch.
@@ -117,29 +125,34 @@ class LayerBuilder(InitializationFunctions):
         :param switch: Логический флаг, определяющий, будет ли смещение добавлено (если True) или вычтено (если False) из взвешенной суммы.
         :param test_mode: Флаг, указывающий на тестовый режим. При включенном тестовом режиме задается фиксированное начальное значение для генератора случайных чисел для воспроизводимости.
 
-        :return: Список значений, вычисленных для каждого нейрона после применения функции активации.
+        :return: Массив значений, вычисленных для каждого нейрона после применения функции активации.
+            Для пакета образцов - массив формы (количество образцов, количество нейронов).
         """
         if test_mode:
             seed(0)
-        logger.info(f'Вычисление данных для {neuron_number} нейронов с bias={bias}. Используя switch={switch}')
-        # Инициализация списка для хранения результатов вычислений нейронов.
-        neuron_dataset: list[float] = []
-        # Проходим по каждому нейрону
-        for n in range(neuron_number):
-            # Для каждого нейрона вычисляется взвешенная сумма входных данных и соответствующих весов.
-            # Если `switch` равен `True`, то к каждой взвешенной сумме добавляется смещение `bias`.
-            # Если `switch` равен `False`, то смещение вычитается.
-            neuron_output = sum(i * w + bias if switch else i * w - bias for i, w in zip(input_dataset, weights[n]))
-            # Результат взвешенной суммы передается функции активации,
-            # и результат этой функции добавляется в список результатов.
-            neuron_dataset.append(activate_func(neuron_output))
-        logger.info(f'Результаты вычислений: {neuron_dataset}')
+        logger.info('Вычисление данных для %s нейронов с bias=%s. Используя switch=%s', neuron_number, bias, switch)
+        input_dataset = np.asarray(input_dataset, dtype=WEIGHT_DTYPE)
+        weights = np.asarray(weights, dtype=WEIGHT_DTYPE)[:neuron_number]
+        # Учитываются только пары вход-вес, то есть первые size входов каждого нейрона.
+        size: int = min(input_dataset.shape[-1], weights.shape[1])
+        # Для каждого нейрона вычисляется взвешенная сумма входных данных и соответствующих весов одним умножением матриц.
+        # Смещение `bias` добавляется (если `switch` равен `True`) или вычитается для каждой пары вход-вес.
+        neuron_output: np.ndarray = input_dataset[..., :size] @ weights[:, :size].T
+        # Смещение прибавляется на месте, без создания промежуточного массива.
+        np.add(neuron_output, (bias if switch else -bias) * size, out=neuron_output)
+        # Результат взвешенной суммы передается функции активации.
+        neuron_dataset: np.ndarray = activate_func(neuron_output)
+        # Аргументы форматируются самим логгером и только для записей, прошедших фильтр по уровню.
+        logger.info('Результаты вычислений: %s', neuron_dataset)
         return neuron_dataset
 
 
 class HiddenLayer(LayerBuilder):
     """Класс представляет собой скрытый слой нейронной сети."""
 
+    # Атрибуты слоя хранятся в слотах, без словаря __dict__ у каждого экземпляра.
+    __slots__ = ('input_dataset', 'neuron_number', 'weights', 'bias', 'activate_func', 'switch', 'test_mode')
+
     def __init__(
             self, training, init_func, input_dataset: list[int | float],
             weights: list[list[float]], bias: float | tuple[float, float],
@@ -149,7 +162,7 @@ class HiddenLayer(LayerBuilder):
             seed(0)
         self.input_dataset: list[int | float] = input_dataset
         self.neuron_number: int = neuron_number
-        self.weights: list[list[float]] = self.select_weights_mode(
+        self.weights: np.ndarray = self.select_weights_mode(
             training, len(input_dataset), neuron_number, weights, init_func, test_mode
         )
         self.bias: float | tuple[float, float] = self.select_bias_mode(
@@ -159,14 +172,15 @@ class HiddenLayer(LayerBuilder):
         self.switch: bool = switch
         self.test_mode = test_mode
 
-    def get_layer_dataset(self) -> list[float]:
+    def get_layer_dataset(self) -> np.ndarray:
         """
         Вычисляет и возвращает выходы слоя с учетом весов, смещений и функции активации.
 
-        :return: Список значений, представляющих выходы каждого нейрона после применения функции активации.
+        :return: Массив значений, представляющих выходы каждого нейрона после применения функции активации.
+            Если входные данные слоя - пакет образцов, возвращается массив выходов для каждого образца.
         """
         # Вызывается метод calculate_neuron_dataset для расчета выходных данных каждого нейрона.
-        result: list[float] = self.calculate_neuron_dataset(
+        result: np.ndarray = self.calculate_neuron_dataset(
             self.input_dataset, self.neuron_number, self.weights, self.bias,
             self.activate_func, self.switch, self.test_mode
         )
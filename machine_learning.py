@@ -1,28 +1,46 @@
-import pickle
+from typing import BinaryIO
+
+import numpy as np
 
 from config_files.configuration import logger, make_directory
 from data import Data
+from support_functions import WEIGHT_DTYPE
 from visualisation import Visualisation
 
+# Штраф Elastic Net регуляризации для каждой комбинации флагов (Lasso, Ridge).
+# Lasso добавляет к градиенту знак веса (для нулевого веса - ноль), Ridge - сам вес,
+# оба умножаются на параметр регуляризации.
+_REGULARIZATION_TERMS: dict[tuple[bool, bool], callable] = {
+    (False, False): lambda weights, regularization: 0.0,
+    (True, False): lambda weights, regularization: regularization * np.sign(weights),
+    (False, True): lambda weights, regularization: regularization * weights,
+    (True, True): lambda weights, regularization: (
+            regularization * np.sign(weights) + regularization * weights
+    ),
+}
+
 
 class MachineLearning(Visualisation, Data):
     """Класс отвечает за процесс обучения модели."""
 
     @staticmethod
     def _save_weights_and_biases(
-            filename: str, weights: dict[str, list[list[float]]], biases: dict[str, list[float]]
+            filename: str | BinaryIO, weights: dict[str, np.ndarray], biases: dict[str, float | np.ndarray]
     ) -> None:
         """
-        Сохраняет веса и смещения в файл.
+        Сохраняет веса и смещения в несжатый архив NumPy (.npz).
+        Веса слоя хранятся под ключом 'w_<имя слоя>', смещения - под ключом 'b_<имя слоя>'.
 
-        :param filename: Имя файла, в который будут загружены веса и смещения.
+        :param filename: Имя файла или открытый бинарный файловый объект, в который будут загружены веса и смещения.
         :param weights: Словарь весов, где ключи - имена слоев, значения - веса слоев.
         :param biases: Словарь смещений, где ключи - имена слоев, значения - смещения слоев.
         """
-        data: dict = {'weights': weights, 'biases': biases}
+        arrays: dict[str, np.ndarray] = {
+            **{f'w_{name}': np.asarray(values, dtype=WEIGHT_DTYPE) for name, values in weights.items()},
+            **{f'b_{name}': np.asarray(values) for name, values in biases.items()}
+        }
         try:
-            with open(filename, 'wb') as file:
-                pickle.dump(data, file)
+            np.savez(filename, **arrays)
             logger.info('Данные успешно сохранены!')
         except Exception as e:
             logger.error(f'Произошла ошибка: {e}')
@@ -39,104 +57,65 @@ class MachineLearning(Visualisation, Data):
         return ((predicted - target) / target) * 100
 
     @staticmethod
-    def _get_lasso_regularization(regularization: float, weights: list[list[float]], i: int, j: int) -> float:
-        """
-        Вычисляет Lasso регуляризацию для данного веса.
-        Добавляет абсолютное значение величины коэффициентов как штраф к функции потерь.
-
-        :param regularization: Параметр регуляризации.
-        :param weights: Список весов.
-        :param i: Индекс первой координаты веса.
-        :param j: Индекс второй координаты веса.
-        :return: Значение Lasso регуляризации.
-        """
-        return regularization * (1 if weights[i][j] > 0 else -1)
-
-    @staticmethod
-    def _get_ridge_regularization(regularization: float, weights: list[list[float]], i: int, j: int) -> float:
-        """
-        Вычисляет Ridge регуляризацию для данного веса.
-        Добавляет квадрат величины коэффициентов как штраф к функции потерь.
-
-        :param regularization: Параметр регуляризации.
-        :param weights: Список весов.
-        :param i: Индекс первой координаты веса.
-        :param j: Индекс второй координаты веса.
-        :return: Значение Ridge регуляризации.
-        """
-        return regularization * weights[i][j]
-
-    @staticmethod
-    def _calculate_gradient_descent(
-            input_dataset: list[float], learning_rate: float,
-            gradient: float, weights: list[list[float]], i: int, j: int
-    ) -> None:
+    def _get_learning_rate_schedule(epochs: int, learning_rate: float, learning_decay: float) -> np.ndarray:
         """
-        Обновляет вес с использованием градиентного спуска.
+        Вычисляет скорость обучения для каждой эпохи заранее.
+        Скорость умножается на коэффициент уменьшения после каждой четверти от общего количества эпох.
 
-        :param input_dataset: Входной набор данных.
-        :param learning_rate: Скорость обучения.
-        :param gradient: Градиент.
-        :param weights: Список весов.
-        :param i: Индекс первой координаты веса.
-        :param j: Индекс второй координаты веса.
-        """
-        weights[i][j] -= learning_rate * gradient * input_dataset[j]
-
-    @staticmethod
-    def _calculate_learning_decay(epoch: int, epochs: int, learning_rate: float, learning_decay: float) -> float:
-        """
-        Вычисляет уменьшение скорости обучения (learning_rate) в зависимости от текущей эпохи.
-
-        :param epoch: Текущая эпоха.
         :param epochs: Общее количество эпох.
-        :param learning_rate: Текущая скорость обучения.
+        :param learning_rate: Начальная скорость обучения.
         :param learning_decay: Коэффициент уменьшения скорости обучения.
-        :return: Обновленная скорость обучения.
+        :return: Массив скоростей обучения, где индекс - номер эпохи.
         """
-        if epoch % (epochs // 4) == 0 and epoch != 0:
-            learning_rate *= learning_decay
-        return learning_rate
+        step: int = epochs // 4
+        if not step:
+            return np.full(epochs, learning_rate)
+        # Уменьшение применяется в конце эпохи, поэтому действует начиная со следующей.
+        decay_count: np.ndarray = np.maximum(np.arange(epochs) - 1, 0) // step
+        return learning_rate * np.power(learning_decay, decay_count)
 
     def _update_weights(
-            self, layer, gradient: float, lasso_regularization: bool,
+            self, layer, gradient: float | np.ndarray, lasso_regularization: bool,
             ridge_regularization: bool, learning_rate: float, regularization: float
     ) -> None:
         """
         Обновляет веса слоя с использованием заданных параметров Elastic Net регуляризации.
+        Если входные данные слоя - пакет образцов, веса и смещение обновляются на среднее по пакету.
 
         :param layer: Объект слоя.
-        :param gradient: Градиент.
+        :param gradient: Градиент или массив градиентов для каждого образца пакета.
         :param lasso_regularization: Использовать Lasso регуляризацию.
         :param ridge_regularization: Использовать Ridge регуляризацию.
         :param learning_rate: Скорость обучения.
         :param regularization: Параметр регуляризации.
         """
-        for i in range(len(layer.weights)):
-            for j in range(len(layer.weights[i])):
-                regularization_term: float = 0.0
-                if lasso_regularization:
-                    regularization_term += self._get_lasso_regularization(regularization, layer.weights, i, j)
-                if ridge_regularization:
-                    regularization_term += self._get_ridge_regularization(regularization, layer.weights, i, j)
-                self._calculate_gradient_descent(
-                    layer.input_dataset, learning_rate, gradient + regularization_term, layer.weights, i, j
-                )
-                if not lasso_regularization and not ridge_regularization:
-                    self._calculate_gradient_descent(
-                        layer.input_dataset, learning_rate, gradient, layer.weights, i, j
-                    )
-        layer.bias -= learning_rate * gradient
+        weights: np.ndarray = layer.weights
+        input_dataset: np.ndarray = np.atleast_2d(np.asarray(layer.input_dataset, dtype=weights.dtype))
+        input_dataset = input_dataset[:, :weights.shape[1]]
+        gradients: np.ndarray = np.broadcast_to(gradient, len(input_dataset))
+        # Вид регуляризации выбирается один раз для всей матрицы весов.
+        regularization_term: np.ndarray | float = _REGULARIZATION_TERMS[
+            (lasso_regularization, ridge_regularization)
+        ](weights, regularization)
+        # Средние по пакету произведение градиента на входные данные и сами входные данные.
+        weighted_input: np.ndarray = gradients @ input_dataset / len(input_dataset)
+        mean_input: np.ndarray = input_dataset.mean(axis=0)
+        # Обновление всех весов слоя одной векторной операцией градиентного спуска.
+        weights -= learning_rate * (weighted_input + regularization_term * mean_input)
+        layer.bias -= learning_rate * gradients.mean()
 
     def _train(
-            self, data_key: str, layer, epochs: int, learning_rate: float, learning_decay: float,
-            error_tolerance: float, regularization: float, lasso_regularization: bool, ridge_regularization: bool
-    ) -> tuple[list[list[float]], float]:
+            self, data_key: str, layer, input_dataset: list[float] | np.ndarray, epochs: int, learning_rate: float,
+            learning_decay: float, error_tolerance: float, regularization: float,
+            lasso_regularization: bool, ridge_regularization: bool
+    ) -> tuple[np.ndarray, float]:
         """
         Обучает слой на основании данных.
+        Входные данные могут быть пакетом образцов одного класса, тогда за эпоху выполняется одно обновление весов.
 
-        :param layer: Объект слоя.
         :param data_key: Ключ данных.
+        :param layer: Объект слоя.
+        :param input_dataset: Входные данные слоя или пакет образцов (по образцу в строке).
         :param epochs: Количество эпох для обучения.
         :param learning_rate: Скорость обучения.
         :param learning_decay: Уменьшение скорости обучения.
@@ -146,17 +125,21 @@ class MachineLearning(Visualisation, Data):
         :param ridge_regularization: Использовать Ridge регуляризацию.
         :return: Кортеж с обновленными весами и смещением (bias) слоя.
         """
+        # Входные данные и целевое значение не меняются между эпохами, поэтому задаются один раз.
+        layer.input_dataset = input_dataset
+        target: float = self.get_target_value_by_key(data_key)
+        learning_rates: np.ndarray = self._get_learning_rate_schedule(epochs, learning_rate, learning_decay)
         for epoch in range(epochs):
-            layer.input_dataset = self.get_data_sample()
-            prediction: float = sum(layer.get_layer_dataset())
-            target: float = self.get_target_value_by_key(data_key)
-            gradient: float = prediction - target
+            learning_rate = learning_rates[epoch]
+            # Прогноз для каждого образца - сумма выходов слоя.
+            predictions: float | np.ndarray = layer.get_layer_dataset().sum(axis=-1)
+            gradient: float | np.ndarray = predictions - target
             self._update_weights(
                 layer, gradient, lasso_regularization, ridge_regularization, learning_rate, regularization
             )
+            prediction: float = float(np.mean(predictions))
             self.get_train_visualisation(epoch, self._calculate_error, prediction, target, layer)
-            learning_rate = self._calculate_learning_decay(epoch, epochs, learning_rate, learning_decay)
-            if abs(prediction - target) < error_tolerance:
+            if np.max(np.abs(gradient)) < error_tolerance:
                 return layer.weights, layer.bias
         return layer.weights, layer.bias
 
@@ -177,22 +160,24 @@ class MachineLearning(Visualisation, Data):
         :param lasso_regularization: Использовать Lasso регуляризацию.
         :param ridge_regularization: Использовать Ridge регуляризацию.
         """
-        weights: dict[str, list[list[float]]] = {}
-        biases: dict[str, list[float]] = {}
+        weights: dict[str, np.ndarray] = {}
+        biases: dict[str, float] = {}
 
         for data_key, data_samples in self.dataset[self.data_name].items():
-            for _ in data_samples:
-                hidden_layer_first.input_dataset = self.get_data_sample()
-                self._train(
-                    data_key, hidden_layer_first, epochs, learning_rate, learning_decay,
-                    error_tolerance, regularization, lasso_regularization, ridge_regularization
-                )
-                hidden_layer_second.input_dataset = hidden_layer_first.get_layer_dataset()
-                self._train(
-                    data_key, hidden_layer_second, epochs, learning_rate, learning_decay,
-                    error_tolerance, regularization, lasso_regularization, ridge_regularization
-                )
-                self.get_train_layers_on_dataset_visualisation(data_key, hidden_layer_second)
+            # Класс без подходящих изображений кодируется пустым списком, обучать на нем нечего.
+            if not len(data_samples):
+                continue
+            # Все образцы класса обучаются одним пакетом: одно умножение матриц за эпоху вместо цикла по образцам.
+            self._train(
+                data_key, hidden_layer_first, data_samples, epochs, learning_rate, learning_decay,
+                error_tolerance, regularization, lasso_regularization, ridge_regularization
+            )
+            # Второй слой обучается на выходах первого слоя, а не на исходных образцах.
+            self._train(
+                data_key, hidden_layer_second, hidden_layer_first.get_layer_dataset(), epochs, learning_rate,
+                learning_decay, error_tolerance, regularization, lasso_regularization, ridge_regularization
+            )
+            self.get_train_layers_on_dataset_visualisation(data_key, hidden_layer_second)
 
         weights['hidden_layer_first'] = hidden_layer_first.weights
         weights['hidden_layer_second'] = hidden_layer_second.weights
@@ -201,4 +186,4 @@ class MachineLearning(Visualisation, Data):
         biases['hidden_layer_second'] = hidden_layer_second.bias
 
         make_directory('weights_and_biases')
-        self._save_weights_and_biases('weights_and_biases/weights_and_biases.pkl', weights, biases)
+        self._save_weights_and_biases('weights_and_biases/weights_and_biases.npz', weights, biases)
@@ -1,15 +1,17 @@
-from pickle import load
+from typing import BinaryIO
+
+import numpy as np
 
 from config_files.configuration import logger
 from layers import LayerBuilder, HiddenLayer
 from machine_learning import MachineLearning
-from support_functions import ActivationFunctions
+from support_functions import ActivationFunctions, WEIGHT_DTYPE
 
 
 class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
     """Класс построения многослойной нейронной сети."""
 
-    def __init__(self, training, init_func, input_dataset: list[float]):
+    def __init__(self, training, init_func, input_dataset: list[float] | np.ndarray):
         """
         Инициализирует экземпляр класса с заданными параметрами обучения, методом инициализации.
 
@@ -17,37 +19,53 @@ class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
         :param init_func: Метод инициализации весов нейронной сети.
         :param input_dataset: Набор входных данных, представленный списком чисел.
         :param layers (dict): Задействованные в текущей модели слои.
+        :param _layer_seq (tuple | None): Слои в порядке добавления для прямого прохода; None, если нужно пересобрать.
+        :param _parameters (dict | None): Веса и смещения, загруженные из файла; None, если файл еще не читался.
         """
         super().__init__()
         self.training = training
         self.initialization = init_func
         self.input_dataset = self._validate_input_dataset(input_dataset)
         self.layers: dict[str, object] = {}
+        self._layer_seq: tuple | None = None
+        self._parameters: dict | None = None
 
     @staticmethod
-    def _load_weights_and_biases(filename: str) -> dict:
+    def _load_weights_and_biases(filename: str | BinaryIO) -> dict:
         """
-        Загружает веса и смещения из указанного файла.
+        Загружает веса и смещения из указанного архива NumPy (.npz).
 
-        :param filename: Имя файла, из которого будут загружены веса и смещения.
+        :param filename: Имя файла или открытый бинарный файловый объект, из которого будут загружены веса и смещения.
         :return: Словарь с весами и смещениями.
         """
-        with open(filename, 'rb') as file:
-            data: dict[str, dict[str, any]] = load(file)
+        data: dict[str, dict[str, any]] = {'weights': {}, 'biases': {}}
+        with np.load(filename) as file:
+            for key in file.files:
+                # Префикс ключа определяет тип параметра: 'w_' - веса, 'b_' - смещения.
+                group: str = 'weights' if key.startswith('w_') else 'biases'
+                value: np.ndarray = file[key]
+                if group == 'weights':
+                    value = value.astype(WEIGHT_DTYPE, copy=False)
+                data[group][key[2:]] = value.item() if value.ndim == 0 else value
         return data
 
     @staticmethod
-    def _validate_input_dataset(input_dataset: list) -> list[float]:
+    def _validate_input_dataset(input_dataset: list | np.ndarray) -> list[float] | np.ndarray:
         """
         Проверяет корректность входных данных.
         Входные данные считаются корректными, если:
-        - Они представлены в виде списка.
+        - Они представлены в виде списка или числового массива NumPy.
         -
 
         :param input_dataset: Список входных данных, который нужно проверить на корректность.
         :return: Проверенный список входных данных.
         :raises ValueError: Если входные данные некорректны.
         """
+        # Образцы из набора данных хранятся в виде массивов NumPy, для них достаточно проверить тип элементов.
+        if isinstance(input_dataset, np.ndarray):
+            if not np.issubdtype(input_dataset.dtype, np.number):
+                raise ValueError(f'Все элементы массива "{input_dataset}" должны быть числами!')
+            return input_dataset
         # Входные данные считаются корректными, если они представлены в виде списка
         # или если все элементы списка являются целыми числами (int) или вещественными числами (float).
         if not isinstance(input_dataset, list):
@@ -57,16 +75,44 @@ class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
         return input_dataset
 
     @staticmethod
-    def _propagate(layer) -> list[float]:
+    def _propagate(layer) -> np.ndarray:
         """
         Пропускает данные через слой и возвращает результаты.
         Метод вызывает get_layer_dataset() у переданного объекта слоя и возвращает результаты.
 
         :param layer: Объект слоя, содержащий метод get_layer_dataset().
-        :return: Данные слоя в виде списка float.
+        :return: Данные слоя в виде массива NumPy.
         """
         return layer.get_layer_dataset()
 
+    def predict_batch(self, input_batch: list[list[float]] | np.ndarray) -> np.ndarray:
+        """
+        Вычисляет выход сети сразу для пакета образцов.
+        Каждый слой обрабатывает весь пакет одним умножением матриц вместо отдельного прохода для каждого образца.
+
+        :param input_batch: Пакет входных данных, по образцу в строке.
+        :return: Массив выходов сети, по одному значению для каждого образца.
+        """
+        activations: np.ndarray = np.atleast_2d(np.asarray(input_batch, dtype=WEIGHT_DTYPE))
+        for layer in self._get_layer_sequence():
+            activations = layer.calculate_neuron_dataset(
+                activations, layer.neuron_number, layer.weights, layer.bias,
+                layer.activate_func, layer.switch, layer.test_mode
+            )
+        # Выход сети, как и в build_neural_network, - сигмоида от суммы выходов последнего слоя.
+        return self.get_sigmoid(activations.sum(axis=-1))
+
+    def _get_layer_sequence(self) -> tuple:
+        """
+        Возвращает слои сети в порядке добавления.
+        Кортеж собирается один раз после изменения набора слоев и далее переиспользуется при каждом проходе.
+
+        :return: Кортеж объектов слоев.
+        """
+        if self._layer_seq is None:
+            self._layer_seq = tuple(self.layers.values())
+        return self._layer_seq
+
     def _add_layer(self, name: str, layer: object) -> None:
         """
         Добавляет слой в нейронную сеть.
@@ -79,11 +125,30 @@ class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
         """
         logger.info(f'Добавление слоя "{name}" в сеть.')
         self.layers[name] = layer
+        # Набор слоев изменился, поэтому кортеж для прямого прохода будет собран заново.
+        self._layer_seq = None
+
+    def _get_parameters(self) -> dict:
+        """
+        Возвращает веса и смещения из файла 'weights_and_biases.npz'.
+        Файл читается один раз, и все создаваемые слои используют уже загруженные данные.
+        Если файл не найден, возвращаются пустые значения.
+
+        :return: Словарь с весами и смещениями.
+        """
+        if self._parameters is None:
+            try:
+                # Пытается загрузить веса и смещения из файла.
+                self._parameters = self._load_weights_and_biases('weights_and_biases/weights_and_biases.npz')
+            except FileNotFoundError:
+                logger.error('Файл weights_and_biases.npz не найден!')
+                self._parameters = {'weights': {}, 'biases': {}}
+        return self._parameters
 
     def _create_layer(self, layer_class, layer_name: str, input_dataset, *args):
         """
         Вспомогательный метод для создания и добавления слоя.
-        Метод пытается загрузить веса и смещения из файла 'weights_and_biases.pkl'.
+        Метод берет веса и смещения слоя из файла 'weights_and_biases.npz' (см. _get_parameters).
         Если файл не найден, используются пустые значения. Затем создается слой,
         и добавляется в нейронную сеть с использованием метода add_layer().
 
@@ -93,13 +158,9 @@ class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
         :param args: Дополнительные аргументы для создания слоя.
         :return: Созданный объект слоя
         """
-        try:
-            # Пытается загрузить веса и смещения из файла.
-            data: dict = self._load_weights_and_biases('weights_and_biases/weights_and_biases.pkl')
+        data: dict = self._get_parameters()
+        if layer_name in data['weights']:
             logger.info(f'Веса и смещения для слоя "{layer_name}" успешно загружены и установлены.')
-        except FileNotFoundError:
-            logger.error('Файл weights_and_biases.pkl не найден!')
-            data = {'weights': {}, 'biases': {}}
         weights = data['weights'].get(layer_name)
         bias = data['biases'].get(layer_name)
         # Создает объект слоя, инициализируя его текущими весами и смещениями.
@@ -132,6 +193,8 @@ class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
         :param test_mode: Режим тестирования. По умолчанию: False.
         :return: None
         """
+        # Файл весов мог измениться после предыдущего обучения, поэтому при построении он читается заново.
+        self._parameters = None
         hidden_layer_first = self._create_layer(
             HiddenLayer, 'hidden_layer_first',
             self.input_dataset, 24, self.get_tanh, True, test_mode
@@ -140,12 +203,15 @@ class NeuralNetwork(MachineLearning, ActivationFunctions, LayerBuilder):
             HiddenLayer, 'hidden_layer_second',
             self._propagate(hidden_layer_first), 24, self.get_tanh, True, test_mode
         )
-        output_layer = self.get_sigmoid(sum(self._propagate(hidden_layer_second)))
+        output_layer = self.get_sigmoid(float(self._propagate(hidden_layer_second).sum()))
 
         if self.training:
             self.train_layers_on_dataset(
                 hidden_layer_first, hidden_layer_second, epochs, learning_rate, learning_decay,
                 error_tolerance, regularization, lasso_regularization, ridge_regularization
             )
+            # Во время обучения слои получали пакеты образцов, поэтому им возвращаются входные данные сети.
+            hidden_layer_first.input_dataset = self.input_dataset
+            hidden_layer_second.input_dataset = self._propagate(hidden_layer_first)
             logger.info('Обучение нейронной сети завершено.')
         self.get_visualisation(self.input_dataset, self.layers, output_layer)
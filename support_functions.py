@@ -1,3 +1,9 @@
+import numpy as np
+
+# Тип данных весов и входных данных нейронной сети.
+WEIGHT_DTYPE = np.float32
+
+
 class ActivationFunctions:
     """Класс предоставляет реализации различных используемых в нейронных сетях активационных функций."""
 
@@ -11,36 +17,36 @@ class ActivationFunctions:
         return x
 
     @staticmethod
-    def get_relu(x: float) -> float:
+    def get_relu(x: float | np.ndarray) -> float | np.ndarray:
         """
         ReLU (Rectified Linear Unit) активационная функция.
-        :param x: Входное значение.
-        :return: Максимум между нулем и входным значением.
+        :param x: Входное значение или массив значений.
+        :return: Максимум между нулем и входным значением (поэлементно для массива).
         """
-        return max(0.0, x)
+        return np.maximum(0.0, x)
 
     @staticmethod
-    def get_sigmoid(x: float) -> float:
+    def get_sigmoid(x: float | np.ndarray) -> float | np.ndarray:
         """
         Сигмоидная активационная функция.
-        :param x: Входное значение.
-        :return: Значение сигмоидной функции для входного значения.
+        :param x: Входное значение или массив значений.
+        :return: Значение сигмоидной функции для входного значения (поэлементно для массива).
         """
         n: int = 10
-        exp: float = 1.0
+        exp: float | np.ndarray = 1.0
         for i in range(n, 0, -1):
             exp = 1 + x * exp / i
         return 1 / (1 + exp)
 
     @staticmethod
-    def get_tanh(x: float) -> float:
+    def get_tanh(x: float | np.ndarray) -> float | np.ndarray:
         """
         Активационная функция гиперболический тангенс (tanh).
-        :param x: Входное значение.
-        :return: Значение функции tanh для входного значения.
+        :param x: Входное значение или массив значений.
+        :return: Значение функции tanh для входного значения (поэлементно для массива).
         """
-        e_pos_2x: float = 1.0
-        e_neg_2x: float = 1.0
+        e_pos_2x: float | np.ndarray = 1.0
+        e_neg_2x: float | np.ndarray = 1.0
         n: int = 10
         for i in range(n, 0, -1):
             e_pos_2x = 1 + 2 * x * e_pos_2x / i
@@ -48,58 +54,45 @@ class ActivationFunctions:
         return (e_pos_2x - e_neg_2x) / (e_pos_2x + e_neg_2x)
 
     @staticmethod
-    def get_leaky_relu(x: float, alpha: float = 0.01) -> float:
+    def get_leaky_relu(x: float | np.ndarray, alpha: float = 0.01) -> float | np.ndarray:
         """
         Leaky ReLU активационная функция.
-        :param x: Входное значение.
+        :param x: Входное значение или массив значений.
         :param alpha: Сила утечки (по умолчанию 0.01).
-        :return: Максимум между alpha*x и входным значением.
+        :return: Максимум между alpha*x и входным значением (поэлементно для массива).
         """
-        return x if x > 0 else alpha * x
+        # Индексация [()] превращает нульмерный массив обратно в число для скалярного входа.
+        return np.where(np.greater(x, 0), x, np.multiply(alpha, x))[()]
 
     @staticmethod
-    def __exp(x: float, terms: int = 20) -> float:
-        """
-        Вычисляет экспоненту числа x с помощью ряда Тейлора.
-        :param x: Входное значение.
-        :param terms: Количество членов ряда (по умолчанию 20).
-        :return: Значение exp(x).
-        """
-        result: float = 1.0
-        factorial: float = 1.0
-        power: float = 1.0
-        for i in range(1, terms):
-            factorial *= i
-            power *= x
-            result += power / factorial
-        return result
-
-    def get_elu(self, x: float, alpha: float = 1.0) -> float:
+    def get_elu(x: float | np.ndarray, alpha: float = 1.0) -> float | np.ndarray:
         """
         ELU (Exponential Linear Unit) активационная функция.
-        :param x: Входное значение.
+        :param x: Входное значение или массив значений.
         :param alpha: Параметр альфа (по умолчанию 1.0).
-        :return: ELU от входного значения.
+        :return: ELU от входного значения (поэлементно для массива).
         """
-        return x if x >= 0 else alpha * (self.__exp(x) - 1)
+        # Экспонента берется только от неположительной части, чтобы большие x не переполняли её.
+        return np.where(np.greater_equal(x, 0), x, alpha * np.expm1(np.minimum(x, 0)))[()]
 
-    def get_softmax(self, x: float | list[float]) -> list[float]:
+    @staticmethod
+    def get_softmax(x: float | list[float] | np.ndarray) -> np.ndarray:
         """
         Softmax активационная функция.
-        :param x: Входное значение (может быть списком или отдельным числом).
+        :param x: Входное значение (может быть списком, массивом или отдельным числом).
         :return: Softmax распределение значений.
         """
-        if isinstance(x, (float, int)):
-            x = [x]
-        max_val = max(x)
-        exp_values: list[float] = [self.__exp(i - max_val) for i in x]
-        sum_exp: float = sum(exp_values)
-        return [i / sum_exp for i in exp_values]
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        # Вычитание максимума не меняет результат, но защищает экспоненту от переполнения.
+        exp_values: np.ndarray = np.exp(x - x.max())
+        return exp_values / exp_values.sum()
 
 
 class InitializationFunctions:
     """Класс содержит методы для инициализации весов нейронных сетей."""
 
+    __slots__ = ()
+
     @staticmethod
     def get_uniform(value: float = 0.5) -> tuple[float, float]:
         """
@@ -1,28 +1,70 @@
+import copy
+import io
+import json
 import os
-import pickle
 import tempfile
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
 
+import numpy as np
+
 from config_files.configuration import get_json_data
-from data import Data
+from data import Data, _load_dataset
 from main import Control
 from layers import LayerBuilder, HiddenLayer
 from neural_network import NeuralNetwork
 from machine_learning import MachineLearning
-from support_functions import ActivationFunctions, InitializationFunctions
+from support_functions import WEIGHT_DTYPE
+
+# Базовые веса и смещение тестового слоя.
+_BASE_WEIGHTS = ((0.5, 0.25), (0.75, 0.5))
+_BASE_BIAS = 0.1
+
+
+def _make_layer_blob() -> bytes:
+    """
+    Сериализует веса и смещение тестового слоя в архив NumPy (.npz).
+    :return: Содержимое архива в байтах.
+    """
+    buffer = io.BytesIO()
+    np.savez(buffer, w_test_layer=np.array(_BASE_WEIGHTS), b_test_layer=_BASE_BIAS)
+    return buffer.getvalue()
+
+
+# Архив весов тестового слоя создается один раз при импорте модуля.
+_LAYER_BLOB = _make_layer_blob()
+
 
+def _open_patch():
+    """
+    Подменяет builtins.open так, чтобы любой открытый файл содержал архив _LAYER_BLOB.
+    Каждый вызов open получает новый объект чтения, так как np.load закрывает открытый им файл.
+    :return: Объект patch, используемый как контекстный менеджер.
+    """
+    return patch('builtins.open', side_effect=lambda *args, **kwargs: io.BytesIO(_LAYER_BLOB))
 
-class GeneralTestParameters(
-    unittest.TestCase, Control, LayerBuilder,
-    MachineLearning, ActivationFunctions, InitializationFunctions, Data
-):
-    """Класс для установки и управления общими параметрами тестирования."""
+
+class GeneralTestParameters(unittest.TestCase, LayerBuilder, MachineLearning):
+    """
+    Класс для установки и управления общими параметрами тестирования.
+
+    Методы ActivationFunctions, InitializationFunctions и Data доступны через MachineLearning и LayerBuilder,
+    параметры Control - через объект self.control.
+    """
 
     @classmethod
     def setUpClass(cls):
-        """Устанавливает режим тестирования перед запуском всех тестов."""
+        """
+        Устанавливает режим тестирования и неизменяемые параметры перед запуском всех тестов класса.
+
+        Входные данные и объект Control тесты не изменяют, поэтому они создаются один раз на класс.
+        Базовые веса также задаются один раз, а в каждом тесте используется их копия.
+        """
         cls.test_mode = True
+        cls.input_dataset = [0.5, -0.5]  # Продолжайте использовать конкретные данные
+        cls.neuron_number = 2
+        cls.control = Control()
+        cls.base_weights = _BASE_WEIGHTS
 
     @classmethod
     def tearDownClass(cls):
@@ -30,19 +72,13 @@ class GeneralTestParameters(
         cls.test_mode = False
 
     def setUp(self):
-        """Инициализация параметров перед каждым тестом."""
+        """Инициализация изменяемых параметров перед каждым тестом."""
+        self._setup_core()
 
-        self.input_dataset = [0.5, -0.5]  # Продолжайте использовать конкретные данные
-        self.neuron_number = 2
-        self.weights = [[0.5, 0.25], [0.75, 0.5]]
-        self.bias = 0.1
-
-        self.control = Control()
-        self.neural_network = NeuralNetwork(self.control.training, self.control.init_func, self.input_dataset)
-        self.test_layer = HiddenLayer(
-            self.control.training, self.control.init_func, self.input_dataset, self.weights,
-            self.bias, self.neuron_number, self.get_tanh, True, self.test_mode
-        )
+    def _setup_core(self):
+        """Создает веса и смещение, которые используются большинством тестов."""
+        self.weights = [list(row) for row in self.base_weights]
+        self.bias = _BASE_BIAS
 
 
 class TestConfigurationMethods(GeneralTestParameters):
@@ -66,10 +102,10 @@ class TestDataMethods(GeneralTestParameters):
     """Класс для тестирования методов обработки данных."""
 
     @patch.object(Data, 'dataset', {'numbers': {'1': ['sample1', 'sample2', 'sample3']}})
-    def test_get_data_dict(self):
-        expected_data_dict = {1: 'sample1', 2: 'sample2', 3: 'sample3'}
-        result = self.get_data_dict()
-        self.assertEqual(result, expected_data_dict)
+    def test_samples(self):
+        expected_samples = ['sample1', 'sample2', 'sample3']
+        result = self._samples()
+        self.assertEqual(result, expected_samples)
 
     @patch.object(Data, 'dataset', {'numbers': {'1': ['sample1', 'sample2', 'sample3']}})
     @patch.object(Data, 'data_number', 2)
@@ -78,6 +114,15 @@ class TestDataMethods(GeneralTestParameters):
         result = self.get_data_sample()
         self.assertEqual(result, expected_sample)
 
+    @patch.object(Data, 'dataset', {'numbers': {'1': ['sample1', 'sample2', 'sample3']}})
+    def test_get_data_sample_out_of_range(self):
+        for data_number in (-1, 0, 4):
+            with self.subTest(data_number=data_number), patch.object(Data, 'data_number', data_number):
+                with self.assertRaises(ValueError):
+                    self.get_data_sample()
+        with patch.object(Data, 'data_class_name', 2), self.assertRaises(ValueError):
+            self.get_data_sample()
+
     @patch.object(Data, 'dataset', {'numbers': {'1': ['sample0', 'sample1', 'sample2', 'sample3']}})
     @patch.object(Data, 'data_number', 2)
     def test_get_normalized_target_value(self):
@@ -85,6 +130,20 @@ class TestDataMethods(GeneralTestParameters):
         result = self.get_normalized_target_value(3)
         self.assertAlmostEqual(result, expected_normalized_value)
 
+    def test_load_dataset_converts_samples_to_arrays(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as temp_file:
+            json.dump({'numbers': {'1': [[0.0, 0.5], [1.0, 0.25]], '2': [[0.75, 0.0]]}}, temp_file)
+        dataset = _load_dataset(temp_file.name)
+        os.remove(temp_file.name)
+        self.assertEqual(list(dataset['numbers']), ['1', '2'])
+        self.assertEqual(dataset['numbers']['1'].dtype, np.float32)
+        self.assertEqual(dataset['numbers']['1'].shape, (2, 2))
+        np.testing.assert_array_equal(dataset['numbers']['2'], [[0.75, 0.0]])
+
+    def test_load_dataset_file_not_found(self):
+        with self.assertRaises(ValueError):
+            _load_dataset('encoders/non_existing_file.json')
+
     def test_get_target_value_by_key_valid_key(self):
         key = '3'
         expected_value = 0.3
@@ -103,6 +162,15 @@ class TestDataMethods(GeneralTestParameters):
         result = self.get_target_value_by_key(key)
         self.assertEqual(result, expected_value, f"Метод вернул неправильное значение для ключа {key}")
 
+    def test_get_target_value_by_key_follows_dataset(self):
+        with patch.object(Data, 'dataset', {'numbers': {'2': [], '4': []}}):
+            self.assertEqual(self.get_target_value_by_key('4'), 0.4)
+            self.assertEqual(self.get_target_value_by_key('5'), 0.0)
+        # После замены набора данных результат зависит от нового набора, а не от прошлых вызовов.
+        with patch.object(Data, 'dataset', {'numbers': {'5': []}}):
+            self.assertEqual(self.get_target_value_by_key('5'), 0.5)
+            self.assertEqual(self.get_target_value_by_key('4'), 0.0)
+
 
 class TestInitializationFunctions(GeneralTestParameters):
     """Тесты для методов инициализации весов в нейронных сетях."""
@@ -149,9 +217,19 @@ class TestActivationFunctions(GeneralTestParameters):
         self.assertEqual(self.get_elu(1.0), 1.0, "Ошибка get_elu для положительного x")
         self.assertAlmostEqual(self.get_elu(-1.0), -0.6321, places=4, msg="Ошибка get_elu для отрицательного x")
 
+    def test_activation_functions_vectorized(self):
+        xs = np.linspace(-5, 5, 10001)
+        np.testing.assert_array_equal(self.get_relu(xs), np.maximum(xs, 0))
+        np.testing.assert_array_equal(self.get_leaky_relu(xs), np.where(xs > 0, xs, 0.01 * xs))
+        np.testing.assert_allclose(self.get_elu(xs), np.where(xs >= 0, xs, np.exp(xs) - 1), rtol=1e-12, atol=1e-15)
+        # Для функций на основе ряда Тейлора векторный результат должен совпадать со скалярным.
+        for func in (self.get_sigmoid, self.get_tanh):
+            with self.subTest(func=func.__name__):
+                np.testing.assert_allclose(func(xs), [func(float(x)) for x in xs], rtol=1e-12)
+
     def test_get_softmax_single_value(self):
         result = self.get_softmax(1.0)
-        self.assertEqual(result, [1.0], "Ошибка get_softmax для единственного значения")
+        np.testing.assert_array_equal(result, [1.0], "Ошибка get_softmax для единственного значения")
 
     def test_get_softmax_list(self):
         result = self.get_softmax([1.0, 2.0, 3.0])
@@ -159,111 +237,143 @@ class TestActivationFunctions(GeneralTestParameters):
         for r, e in zip(result, expected):
             self.assertAlmostEqual(r, e, places=4, msg="Ошибка get_softmax для списка")
 
+    def test_get_softmax_large_vector(self):
+        x = np.random.default_rng(0).uniform(-1000, 1000, size=10_000)
+        result = self.get_softmax(x)
+        self.assertTrue(np.all(np.isfinite(result)))
+        np.testing.assert_allclose(result.sum(), 1.0)
+        self.assertEqual(int(result.argmax()), int(x.argmax()))
+
 
 class TestMachineLearningMethods(TestDataMethods):
     """Тесты для методов MachineLearning."""
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('pickle.dump')
-    def test_save_weights_and_biases(self, mock_dump, mock_open_instance):
+    @patch('numpy.savez')
+    def test_save_weights_and_biases(self, mock_savez):
         weights = {'layer1': [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], 'layer2': [[0.7, 0.8], [0.9, 1.0], [1.1, 1.2]]}
-        biases = {'layer1': [0.01, 0.02, 0.03], 'layer2': [0.04, 0.05, 0.06]}
-        expected_data = {'weights': weights, 'biases': biases}
-        self._save_weights_and_biases('weights_and_biases/weights_and_biases.pkl', weights, biases)
-        mock_open_instance.assert_called_once_with('weights_and_biases/weights_and_biases.pkl', 'wb')
-        file_handle = mock_open_instance()
-        mock_dump.assert_called_once_with(expected_data, file_handle)
+        biases = {'layer1': 0.01, 'layer2': 0.04}
+        self._save_weights_and_biases('weights_and_biases/weights_and_biases.npz', weights, biases)
+        mock_savez.assert_called_once()
+        args, kwargs = mock_savez.call_args
+        self.assertEqual(args, ('weights_and_biases/weights_and_biases.npz',))
+        self.assertEqual(set(kwargs), {'w_layer1', 'w_layer2', 'b_layer1', 'b_layer2'})
+        for name in weights:
+            self.assertEqual(kwargs[f'w_{name}'].dtype, WEIGHT_DTYPE)
+            np.testing.assert_allclose(kwargs[f'w_{name}'], weights[name], rtol=1e-6)
+            np.testing.assert_array_equal(kwargs[f'b_{name}'], biases[name])
 
     def test_calculate_error(self):
         result = self._calculate_error(110, 100)
         self.assertAlmostEqual(result, 10.0, places=4, msg="Ошибка calculate_error")
 
-    def test_get_lasso_regularization_positive_weight(self):
-        weights = [[0.5, -0.2], [0.8, -0.4]]
-        expected_regularization = 0.001
-        result = self._get_lasso_regularization(self.control.regularization, weights, 0, 0)
-        self.assertEqual(result, expected_regularization, "Ошибка get_lasso_regularization")
-
-    def test_get_lasso_regularization_negative_weight(self):
-        weights = [[0.5, -0.2], [0.8, -0.4]]
-        expected_regularization = -0.001
-        result = self._get_lasso_regularization(self.control.regularization, weights, 0, 1)
-        self.assertEqual(result, expected_regularization, "Ошибка get_lasso_regularization")
-
-    def test_get_ridge_regularization(self):
-        weights = [[0.5, -0.2], [0.8, -0.4]]
-        expected_regularization = 0.0005
-        result = self._get_ridge_regularization(self.control.regularization, weights, 0, 0)
-        self.assertEqual(result, expected_regularization, "Ошибка get_ridge_regularization")
-
-    def test_calculate_gradient_descent(self):
-        weights = [[0.5, 0.25], [0.75, 0.5]]
-        input_dataset = [1.0, 2.0]
-        self._calculate_gradient_descent(input_dataset, self.control.learning_rate, 0.1, weights, 0, 0)
-        expected_weight = 0.5 - 0.01 * 0.1 * 1.0
-        self.assertAlmostEqual(weights[0][0], expected_weight, places=2, msg="Ошибка calculate_gradient_descent")
-
-    def test_calculate_learning_decay(self):
-        result = self._calculate_learning_decay(0, 20, 0.1, 0.9)
-        self.assertEqual(result, 0.1)
-        result = self._calculate_learning_decay(5, 20, 0.1, 0.9)
-        self.assertEqual(result, 0.1 * 0.9)
-        result = self._calculate_learning_decay(6, 20, 0.1 * 0.9, 0.9)
-        self.assertEqual(result, 0.1 * 0.9)
-        result = self._calculate_learning_decay(10, 20, 0.1 * 0.9, 0.9)
-        self.assertEqual(result, 0.1 * 0.9 * 0.9)
-        result = self._calculate_learning_decay(11, 20, 0.1 * 0.9 * 0.9, 0.9)
-        self.assertEqual(result, 0.1 * 0.9 * 0.9)
-        result = self._calculate_learning_decay(15, 20, 0.1 * 0.9 * 0.9, 0.9)
-        self.assertEqual(result, 0.1 * 0.9 * 0.9 * 0.9)
+    def test_get_learning_rate_schedule(self):
+        # (количество эпох, эпоха, ожидаемая скорость обучения в этой эпохе) для числа эпох,
+        # не кратного четырем, минимального шага и большого числа эпох.
+        cases = (
+            (10, 1, 0.1),
+            (10, 3, 0.1 * 0.9),
+            (10, 9, 0.1 * 0.9 ** 4),
+            (4, 1, 0.1),
+            (4, 2, 0.1 * 0.9),
+            (4, 3, 0.1 * 0.9 ** 2),
+            (1000, 250, 0.1),
+            (1000, 251, 0.1 * 0.9),
+            (1000, 999, 0.1 * 0.9 ** 3),
+        )
+        for epochs, epoch, expected in cases:
+            with self.subTest(epochs=epochs, epoch=epoch):
+                schedule = self._get_learning_rate_schedule(epochs, 0.1, 0.9)
+                self.assertAlmostEqual(schedule[epoch], expected, places=12)
+
+    def test_get_learning_rate_schedule_sweep(self):
+        epochs, learning_rate, learning_decay = 20, 0.1, 0.9
+        # Скорость после эпохи epoch уменьшена epoch // (epochs // 4) раз; расписание применяет ее со следующей эпохи.
+        decayed = learning_rate * np.power(learning_decay, np.arange(epochs) // (epochs // 4))
+        expected = np.concatenate(([learning_rate], decayed[:-1]))
+        schedule = self._get_learning_rate_schedule(epochs, learning_rate, learning_decay)
+        self.assertEqual(schedule.shape, (epochs,))
+        np.testing.assert_allclose(schedule, expected)
+        # Если эпох меньше четырех, скорость обучения не уменьшается.
+        np.testing.assert_array_equal(self._get_learning_rate_schedule(3, learning_rate, learning_decay), [learning_rate] * 3)
 
     def test_update_weights(self):
         gradient = 0.1
         lasso, ridge = True, True
-        initial_weights, initial_bias = [row[:] for row in self.weights], self.bias
+        self.weights = np.asarray(self.weights, dtype=np.float64)
+        initial_weights, initial_bias = self.weights.copy(), self.bias
         if self.control.training:
-            expected_weights = [[0.49994925, 0.250050625], [0.749949125, 0.50005075]]
+            expected_weights = np.asarray([[0.49994925, 0.250050625], [0.749949125, 0.50005075]], dtype=np.float64)
         else:
-            expected_weights = [
-                [
-                    initial_weights[0][0] - self.control.learning_rate * (
-                            gradient + self._get_lasso_regularization(
-                        self.control.regularization, initial_weights, 0, 0
-                    ) + self._get_ridge_regularization(self.control.regularization, initial_weights, 0, 0)
-                    ) * self.input_dataset[0],
-                    initial_weights[0][1] - self.control.learning_rate * (gradient + self._get_lasso_regularization(
-                        self.control.regularization, initial_weights, 0, 1
-                    ) + self._get_ridge_regularization(self.control.regularization, initial_weights, 0, 1)
-                                                                          ) * self.input_dataset[1],
-                ],
-                [
-                    initial_weights[1][0] - self.control.learning_rate * (
-                            gradient + self._get_lasso_regularization
-                    (self.control.regularization, initial_weights, 1, 0) + self._get_ridge_regularization(
-                        self.control.regularization, initial_weights, 1, 0)
-                    ) * self.input_dataset[0],
-                    initial_weights[1][1] - self.control.learning_rate * (gradient + self._get_lasso_regularization(
-                        self.control.regularization, initial_weights, 1, 1) + self._get_ridge_regularization(
-                        self.control.regularization, initial_weights, 1, 1)
-                                                                          ) * self.input_dataset[1],
-                ]
-            ]
+            regularization_term = self.control.regularization * (np.sign(initial_weights) + initial_weights)
+            expected_weights = initial_weights - self.control.learning_rate * (
+                    gradient + regularization_term
+            ) * np.asarray(self.input_dataset, dtype=np.float64)
         expected_bias = initial_bias - self.control.learning_rate * gradient
         self._update_weights(self, gradient, lasso, ridge, self.control.learning_rate, self.control.regularization)
-        self.assertEqual(self.weights, expected_weights)
-        self.assertEqual(self.bias, expected_bias)
+        np.testing.assert_allclose(self.weights, expected_weights, rtol=1e-12, atol=0)
+        self.assertAlmostEqual(self.bias, expected_bias, places=12)
+
+    def test_update_weights_without_regularization(self):
+        gradient = 0.1
+        self.weights = np.array(self.weights)
+        expected_weights = self.weights - self.control.learning_rate * gradient * np.array(self.input_dataset)
+        self._update_weights(self, gradient, False, False, self.control.learning_rate, self.control.regularization)
+        np.testing.assert_array_equal(self.weights, expected_weights)
+
+    def test_update_weights_batch(self):
+        gradients = np.array([0.1, -0.2, 0.3])
+        batch = np.array([[0.5, -0.5], [0.25, 0.75], [-1.0, 0.0]])
+        initial_weights = np.array(self.weights)
+        regularization_term = self.control.regularization * (np.sign(initial_weights) + initial_weights)
+        expected_weights = initial_weights - self.control.learning_rate * np.mean(
+            [(gradient + regularization_term) * sample for gradient, sample in zip(gradients, batch)], axis=0
+        )
+        expected_bias = self.bias - self.control.learning_rate * gradients.mean()
+        self.weights, self.input_dataset = initial_weights.copy(), batch
+        self._update_weights(
+            self, gradients, True, True, self.control.learning_rate, self.control.regularization
+        )
+        np.testing.assert_allclose(self.weights, expected_weights, rtol=1e-12)
+        self.assertAlmostEqual(self.bias, expected_bias, places=12)
+
+    def test_update_weights_lasso_zero_weight(self):
+        self.weights = np.array([[0.0, 0.5]])
+        self._update_weights(self, 0.0, True, False, self.control.learning_rate, self.control.regularization)
+        expected_weights = [[0.0, 0.5 - self.control.learning_rate * self.control.regularization * -0.5]]
+        np.testing.assert_allclose(self.weights, expected_weights, rtol=1e-12)
+
+    def test_update_weights_single_regularization(self):
+        gradient = 0.1
+        regularization = self.control.regularization
+        input_dataset = np.array(self.input_dataset)
+        initial_weights = np.array([[0.5, -0.25], [-0.75, 0.5]])
+        expected_terms = {
+            (True, False): np.array([[regularization, -regularization], [-regularization, regularization]]),
+            (False, True): regularization * initial_weights,
+        }
+        for (lasso, ridge), term in expected_terms.items():
+            with self.subTest(lasso=lasso, ridge=ridge):
+                self.weights = initial_weights.copy()
+                expected_weights = initial_weights - self.control.learning_rate * (gradient + term) * input_dataset
+                self._update_weights(self, gradient, lasso, ridge, self.control.learning_rate, regularization)
+                np.testing.assert_array_equal(self.weights, expected_weights)
+
+    def test_update_weights_keeps_dtype(self):
+        for dtype in (np.float32, np.float64):
+            with self.subTest(dtype=dtype):
+                self.weights = np.array(self.base_weights, dtype=dtype)
+                self._update_weights(self, 0.1, True, True, self.control.learning_rate, self.control.regularization)
+                self.assertEqual(self.weights.dtype, dtype)
 
     def test_train_method(self):
         self.test_layer = MagicMock()
-        self.test_layer.input_dataset = self.input_dataset
-        self.test_layer.get_layer_dataset.return_value = list(map(sum, zip(*self.weights)))
+        self.test_layer.get_layer_dataset.return_value = np.sum(self.weights, axis=0)
 
-        self.get_data_sample = MagicMock(return_value=self.input_dataset)
         self.get_target_value_by_key = MagicMock(return_value=0.25)
         self._update_weights = MagicMock()
         self.get_train_visualisation = MagicMock()
         self._calculate_error = MagicMock(return_value=0.05)
-        self._calculate_learning_decay = MagicMock(side_effect=lambda e, ep, lr, ld: lr * ld)
+        self._get_learning_rate_schedule = MagicMock(side_effect=lambda ep, lr, ld: np.full(ep, lr * ld))
 
         data_key = 'test_key'
         epochs = 10
@@ -275,7 +385,7 @@ class TestMachineLearningMethods(TestDataMethods):
         ridge_regularization = True
 
         result = self._train(
-            data_key, self.test_layer, epochs, learning_rate, learning_decay, error_tolerance,
+            data_key, self.test_layer, self.input_dataset, epochs, learning_rate, learning_decay, error_tolerance,
             regularization, lasso_regularization, ridge_regularization
         )
 
@@ -289,11 +399,47 @@ class TestMachineLearningMethods(TestDataMethods):
         self.assertIsNotNone(weights, "Веса должны быть определены")
         self.assertIsNotNone(bias, "Смещение должно быть определено")
 
-        self.get_data_sample.assert_called()
+        self.assertEqual(self.test_layer.input_dataset, self.input_dataset)
         self.get_target_value_by_key.assert_called_with(data_key)
         self._update_weights.assert_called()
         self.get_train_visualisation.assert_called()
-        self._calculate_learning_decay.assert_called()
+        self._get_learning_rate_schedule.assert_called_once_with(epochs, learning_rate, learning_decay)
+
+    @patch.object(Data, 'dataset', {'numbers': {'1': [[0.5, -0.5], [0.25, 0.75]]}})
+    @patch('machine_learning.make_directory', MagicMock())
+    def test_train_layers_on_dataset(self):
+        hidden_layer_first, hidden_layer_second = MagicMock(), MagicMock()
+        hidden_layer_first.get_layer_dataset.return_value = np.array([0.25, 0.75])
+        self._train = MagicMock()
+        self._save_weights_and_biases = MagicMock()
+        self.get_train_layers_on_dataset_visualisation = MagicMock()
+
+        self.train_layers_on_dataset(
+            hidden_layer_first, hidden_layer_second, 10, 0.01, 0.9, 0.05, 0.01, True, True
+        )
+
+        (first_call, second_call) = self._train.call_args_list
+        self.assertIs(first_call.args[1], hidden_layer_first)
+        self.assertEqual(first_call.args[2], [[0.5, -0.5], [0.25, 0.75]])
+        self.assertIs(second_call.args[1], hidden_layer_second)
+        np.testing.assert_array_equal(second_call.args[2], [0.25, 0.75])
+        self._save_weights_and_biases.assert_called_once()
+
+    @patch.object(Data, 'dataset', {'numbers': {'1': np.zeros((3, 6), dtype=WEIGHT_DTYPE), '2': np.zeros((0,))}})
+    @patch('machine_learning.make_directory', MagicMock())
+    def test_train_layers_on_dataset_skips_empty_class(self):
+        hidden_layer_first, hidden_layer_second = MagicMock(), MagicMock()
+        self._train = MagicMock()
+        self._save_weights_and_biases = MagicMock()
+        self.get_train_layers_on_dataset_visualisation = MagicMock()
+
+        self.train_layers_on_dataset(
+            hidden_layer_first, hidden_layer_second, 10, 0.01, 0.9, 0.05, 0.01, True, True
+        )
+
+        self.assertEqual([call.args[0] for call in self._train.call_args_list], ['1', '1'])
+        self.get_train_layers_on_dataset_visualisation.assert_called_once_with('1', hidden_layer_second)
+        self._save_weights_and_biases.assert_called_once()
 
 
 class TestLayerBuilderMethods(TestInitializationFunctions):
@@ -329,9 +475,8 @@ class TestLayerBuilderMethods(TestInitializationFunctions):
         weights = None
         mode = self.control.init_func
         result = self.select_weights_mode(self.training, input_size, neuron_number, weights, mode, self.test_mode)
-        self.assertEqual(len(result), neuron_number)
-        self.assertEqual(len(result[0]), input_size)
-        self.assertEqual(len(result[1]), input_size)
+        self.assertEqual(result.shape, (neuron_number, input_size))
+        self.assertEqual(result.dtype, WEIGHT_DTYPE)
 
     def test_get_weights_mode_existing_weights(self):
         self.training = False
@@ -340,7 +485,18 @@ class TestLayerBuilderMethods(TestInitializationFunctions):
         weights = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
         mode = self.control.init_func
         result = self.select_weights_mode(self.training, input_size, neuron_number, weights, mode, self.test_mode)
-        self.assertEqual(result, weights)
+        self.assertEqual(result.dtype, WEIGHT_DTYPE)
+        np.testing.assert_allclose(result, weights, rtol=1e-6)
+        result = self.select_weights_mode(
+            self.training, input_size, neuron_number, weights, mode, self.test_mode, dtype=np.float64
+        )
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_array_equal(result, weights)
+        # Срез по столбцам не является непрерывным, поэтому веса копируются в непрерывную матрицу.
+        result = self.select_weights_mode(
+            self.training, input_size, neuron_number, np.asarray(weights)[:, ::2], mode, self.test_mode
+        )
+        self.assertTrue(result.flags['C_CONTIGUOUS'])
 
     def test_get_bias_mode_training(self):
         self.training = True
@@ -366,63 +522,139 @@ class TestLayerBuilderMethods(TestInitializationFunctions):
         result = self.calculate_neuron_dataset(
             self.input_dataset, self.neuron_number, weights, self.bias, self.get_tanh, True, self.test_mode
         )
-        self.assertEqual(result, expected_result)
+        np.testing.assert_allclose(result, expected_result, rtol=1e-6)
+
+    def test__calculate_neuron_dataset_batch(self):
+        weights = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        batch = [[0.5, -0.5], [0.25, 0.75], [-1.0, 0.0]]
+        result = self.calculate_neuron_dataset(
+            batch, self.neuron_number, weights, self.bias, self.get_tanh, False, self.test_mode
+        )
+        self.assertEqual(result.shape, (len(batch), self.neuron_number))
+        for sample, sample_result in zip(batch, result):
+            expected_result = self.calculate_neuron_dataset(
+                sample, self.neuron_number, weights, self.bias, self.get_tanh, False, self.test_mode
+            )
+            np.testing.assert_allclose(sample_result, expected_result, rtol=1e-6)
 
 
 class TestNeuralNetworkMethods(GeneralTestParameters):
     """Класс для тестирования методов нейронной сети."""
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        Создает тестовый слой один раз для всех тестов класса.
+        Тестовый слой тесты только читают; тест, изменяющий слой, должен работать с его копией (copy.deepcopy).
+        """
+        super().setUpClass()
+        cls.pristine_test_layer = HiddenLayer(
+            cls.control.training, cls.control.init_func, cls.input_dataset, [list(row) for row in cls.base_weights],
+            _BASE_BIAS, cls.neuron_number, cls.get_tanh, True, cls.test_mode
+        )
+
+    def setUp(self):
+        """Инициализация параметров, нейронной сети и тестового слоя перед каждым тестом."""
+        super().setUp()
+        self._setup_layers()
+
+    def _setup_layers(self):
+        """
+        Создает нейронную сеть и подготавливает тестовый слой.
+        Тесты добавляют в сеть слои, поэтому каждый тест получает новую сеть.
+        """
+        self.neural_network = NeuralNetwork(self.control.training, self.control.init_func, self.input_dataset)
+        self.test_layer = self.pristine_test_layer
+
     def test_load_weights_and_biases(self):
-        test_data = {'weights': self.weights, 'biases': [self.bias, self.bias + 0.1]}
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            filename = temp_file.name
-            with open(filename, 'wb') as file:
-                pickle.dump(test_data, file)
-        loaded_data = self.neural_network._load_weights_and_biases(filename)
-        self.assertEqual(loaded_data, test_data)
-        os.remove(filename)
+        weights = {'test_layer': np.array(self.weights)}
+        biases = {'test_layer': self.bias}
+        buffer = io.BytesIO()
+        self._save_weights_and_biases(buffer, weights, biases)
+        buffer.seek(0)
+        loaded_data = self.neural_network._load_weights_and_biases(buffer)
+        np.testing.assert_array_equal(loaded_data['weights']['test_layer'], weights['test_layer'])
+        self.assertEqual(loaded_data['biases'], biases)
+
+    def test_open_patch_serves_fresh_reader(self):
+        with _open_patch():
+            for _ in range(2):
+                loaded_data = self.neural_network._load_weights_and_biases('weights_and_biases.npz')
+                np.testing.assert_allclose(loaded_data['weights']['test_layer'], _BASE_WEIGHTS, rtol=1e-6)
+                self.assertEqual(loaded_data['biases']['test_layer'], _BASE_BIAS)
 
     def test_validate_input_dataset(self):
         self.assertEqual(self.neural_network._validate_input_dataset([1, 1]), [1, 1])
 
+    def test_validate_input_dataset_array(self):
+        input_dataset = np.array([0.5, -0.5], dtype=np.float32)
+        self.assertIs(self.neural_network._validate_input_dataset(input_dataset), input_dataset)
+        with self.assertRaises(ValueError):
+            self.neural_network._validate_input_dataset(np.array(['a', 'b']))
+
     def test_propagate(self):
         if self.control.training:
-            expected_result = [0.20868983227415003, 0.37649705581299875]
+            expected_result = [0.7160013318061829, 0.059808552265167236]
         else:
             expected_result = [0.5716699659103408, 0.5716699659103408]
-        self.assertEqual(
-            self.neural_network._propagate(self.test_layer), expected_result
-        )
+        # Слой вычисляет в WEIGHT_DTYPE: входные данные float64 принимаются и приводятся к нему,
+        # поэтому результат и его тип не зависят от типа входа.
+        for dtype in (np.float32, np.float64):
+            with self.subTest(dtype=dtype.__name__):
+                layer = copy.copy(self.test_layer)
+                layer.input_dataset = np.asarray(self.input_dataset, dtype=dtype)
+                result = self.neural_network._propagate(layer)
+                self.assertEqual(result.dtype, WEIGHT_DTYPE)
+                np.testing.assert_allclose(result, expected_result, rtol=1e-6, atol=1e-9)
+
+    def test_predict_batch(self):
+        self.neural_network._add_layer('hidden_layer_first', self.test_layer)
+        self.neural_network._add_layer('hidden_layer_second', self.test_layer)
+        input_batch = np.array([[0.5, -0.5], [0.25, 0.75], [-1.0, 0.0]], dtype=WEIGHT_DTYPE)
+        result = self.neural_network.predict_batch(input_batch)
+        self.assertEqual(result.shape, (len(input_batch),))
+        for i, sample in enumerate(input_batch):
+            with self.subTest(sample=i):
+                layer_first, layer_second = copy.deepcopy(self.test_layer), copy.deepcopy(self.test_layer)
+                layer_first.input_dataset = sample
+                layer_second.input_dataset = self.neural_network._propagate(layer_first)
+                expected = self.get_sigmoid(float(self.neural_network._propagate(layer_second).sum()))
+                self.assertAlmostEqual(float(result[i]), expected, places=6)
 
     def test_add_layer(self):
         self.neural_network._add_layer('test_layer', self.test_layer)
         self.assertEqual(self.neural_network.layers['test_layer'], self.test_layer)
 
+    def test_get_layer_sequence(self):
+        self.neural_network._add_layer('test_layer', self.test_layer)
+        sequence = self.neural_network._get_layer_sequence()
+        self.assertEqual(sequence, (self.test_layer,))
+        self.assertIs(self.neural_network._get_layer_sequence(), sequence)
+        other_layer = copy.deepcopy(self.test_layer)
+        self.neural_network._add_layer('other_layer', other_layer)
+        self.assertEqual(self.neural_network._get_layer_sequence(), (self.test_layer, other_layer))
+
     def test_create_layer(self):
         layer_name = 'test_layer'
         input_dataset = self.input_dataset
         layer_class = HiddenLayer
 
-        with unittest.mock.patch(
-                'builtins.open', unittest.mock.mock_open(
-                    read_data=pickle.dumps(
-                        {"weights": {layer_name: self.weights}, "biases": {layer_name: [self.bias, self.bias + 0.1]}}
-                    )
-                )
-        ):
+        with _open_patch():
             layer = self.neural_network._create_layer(
                 layer_class, layer_name, input_dataset, 2, self.get_tanh, True, self.test_mode
             )
             if self.control.training:
-                expected_weights = [
-                    [0.8436577925009958, 0.6318566641080297], [-0.194559098040328, -0.5905309473142218]
-                ]
+                # В тестовом режиме веса генерируются генератором с начальным значением 0.
+                expected_weights = np.random.default_rng(0).uniform(
+                    *self.get_xavier(len(input_dataset), 2), size=(2, len(input_dataset))
+                )
                 expected_bias = 0.0
             else:
                 expected_weights = self.weights
-                expected_bias = [self.bias, self.bias + 0.1]
+                expected_bias = self.bias
             self.assertIn(layer_name, self.neural_network.layers)
-            self.assertEqual(layer.weights, expected_weights)
+            np.testing.assert_array_equal(layer.weights, np.asarray(expected_weights, dtype=WEIGHT_DTYPE))
+            self.assertTrue(layer.weights.flags['C_CONTIGUOUS'])
             self.assertEqual(layer.bias, expected_bias)
 
         with unittest.mock.patch('builtins.open', side_effect=FileNotFoundError):
@@ -433,17 +665,19 @@ class TestNeuralNetworkMethods(GeneralTestParameters):
     def test_build_neural_network(self):
         with unittest.mock.patch.object(
                 self.neural_network, '_create_layer', wraps=self.neural_network._create_layer
-        ) as mock_create_layer:
+        ) as mock_create_layer, unittest.mock.patch.object(
+                self.neural_network, '_load_weights_and_biases', side_effect=FileNotFoundError
+        ) as mock_load:
             self.neural_network.build_neural_network(
                 self.control.epochs, self.control.learning_rate, self.control.learning_decay,
                 self.control.error_tolerance, self.control.regularization, self.control.lasso_regularization,
                 self.control.ridge_regularization, self.test_mode
             )
             self.assertEqual(mock_create_layer.call_count, 2)
-            self.assertIn('hidden_layer_first', self.neural_network.layers)
-            self.assertIn('hidden_layer_second', self.neural_network.layers)
-            self.assertIsInstance(self.neural_network.layers['hidden_layer_first'], HiddenLayer)
-            self.assertIsInstance(self.neural_network.layers['hidden_layer_second'], HiddenLayer)
+            mock_load.assert_called_once_with('weights_and_biases/weights_and_biases.npz')
+            expected_layers = {'hidden_layer_first': HiddenLayer, 'hidden_layer_second': HiddenLayer}
+            self.assertEqual({name: type(layer) for name, layer in self.neural_network.layers.items()}, expected_layers)
+            self.assertFalse(hasattr(self.neural_network.layers['hidden_layer_first'], '__dict__'))
 
 
 if __name__ == '__main__':
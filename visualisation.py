@@ -20,7 +20,7 @@ class Visualisation(ActivationFunctions, Data):
         if epoch % 50 == 0:
             print(
                 f'Эпоха: {epoch}, ошибка: {calculate_error(prediction, target):.1f}%, '
-                f'прогноз: {prediction * 10:.4f}, результат: {sum(layer.get_layer_dataset()):.4f}'
+                f'прогноз: {prediction * 10:.4f}, результат: {layer.get_layer_dataset().sum(axis=-1).mean():.4f}'
             )
 
     @staticmethod
@@ -33,7 +33,7 @@ class Visualisation(ActivationFunctions, Data):
         """
         print(
             f'\nОбучение класса данных {data_class_name} завершено, результат: '
-            f'{sum(output_layer.get_layer_dataset()) * 10:.0f}\n'
+            f'{output_layer.get_layer_dataset().sum(axis=-1).mean() * 10:.0f}\n'
         )
 
     def _calculate_classification(self, output_sum: float, results: dict, margin: float = float('inf')) -> int: